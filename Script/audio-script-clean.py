@@ -1,43 +1,134 @@
 # Import standard library modules for file system operations, external command execution,
-# command-line argument parsing, date/time handling, JSON processing, and path manipulation.
+# command-line argument parsing, date/time handling, JSON processing, timing, and path manipulation.
 import os
 import shutil
 import subprocess
 import argparse
 import datetime
 import json
+import time
 # Import type hinting support for lists and tuples to improve code clarity and static analysis.
-from typing import List, Tuple
+from typing import Iterator, Tuple, Union
 # Import Path from pathlib for modern, cross-platform path handling.
 from pathlib import Path
+# Import ThreadPoolExecutor to run several FFmpeg/ffprobe processes at the same time.
+from concurrent.futures import ThreadPoolExecutor, as_completed
+# Import partial to pass options such as quick mode to the pooled check function.
+from functools import partial
 # Import sys for system-specific parameters and functions, like stdout.
 import sys
-
-# Define a constant list of supported audio file extensions in lowercase.
+# Import orjson for faster parsing of JSON (JSONL logs and ffprobe error reports) if it's installed.
+# It is optional: the standard json module is used when it is missing.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+# Import PyAV for optional in-process decoding with 'check --in-process'.
+# It is optional as well: without it, integrity checks always launch FFmpeg.
+try:
+    import av
+except ImportError:
+    av = None
+
+# Define a constant set of supported audio file extensions in lowercase.
 # These are the file types the script recognizes as audio files for processing.
-AUDIO_EXTENSIONS = ['.flac', '.wav', '.m4a', '.mp3', '.ogg', '.opus', '.ape', '.wv', '.wma']
+# A frozenset makes each membership test a single hash lookup.
+AUDIO_EXTENSIONS = frozenset({'.flac', '.wav', '.m4a', '.mp3', '.ogg', '.opus', '.ape', '.wv', '.wma'})
+
+# Define the cover art file names (in lowercase) that can be hidden, and their hidden, dot-prefixed variants.
+COVER_NAMES = frozenset({"cover.jpg", "cover.jpeg", "cover.png"})
+HIDDEN_COVER_NAMES = frozenset("." + name for name in COVER_NAMES)
+
+# Define the notes added to the info report for the codecs of .m4a files, which can be lossy or lossless.
+M4A_CODEC_NOTES = {
+    "aac": "  [INFO] AAC (lossy) codec detected.\n",
+    "alac": "  [INFO] ALAC (lossless) codec detected.\n",
+}
+# Define the extensions whose codecs are always lossy.
+LOSSY_EXTENSIONS = frozenset({".opus", ".mp3"})
+# Define the names of common channel layouts; other channel counts are shown as a number.
+CHANNEL_NAMES = {1: "Mono", 2: "Stereo", "N/A": "N/A"}
 
 # Define the configuration file path as a Path object.
 # This file stores persistent settings, such as the log folder location.
 CONFIG_FILE = Path("audio-script-config.json")
 
+# Locate the external tools once at startup; each is None if it's not installed.
+# Running them by absolute path also skips the PATH search on every process launch.
+FFMPEG_BIN = shutil.which('ffmpeg')
+FFPROBE_BIN = shutil.which('ffprobe')
+# The reference FLAC tool is optional; it verifies FLAC files natively, including their MD5 signature.
+FLAC_BIN = shutil.which('flac')
+
+# Build the fixed parts of the tool command lines once; only the file path (and options) change per file.
+# FFmpeg runs in error-only mode without reading stdin, and decodes to the null muxer.
+FFMPEG_ARGS = (FFMPEG_BIN, '-nostdin', '-v', 'error')
+FFMPEG_NULL_OUTPUT = ('-f', 'null', '-')
+# ffprobe prints only the fields used in the info report, for the first audio stream, as plain "key=value" lines.
+FFPROBE_ARGS = (FFPROBE_BIN, "-v", "quiet", "-select_streams", "a:0", "-show_entries", "stream=codec_name,sample_rate,channels,bits_per_raw_sample:format=bit_rate", "-of", "default=noprint_wrappers=1")
+# flac runs in test mode (-t), only reporting errors (-s).
+FLAC_TEST_ARGS = (FLAC_BIN, '-t', '-s')
+# For structure-only checks, ffprobe opens the file and reports any error it hits, as JSON.
+FFPROBE_ERROR_ARGS = (FFPROBE_BIN, "-v", "error", "-show_error", "-of", "json")
+
+# Pick the JSON parser: orjson if available, else the standard json module.
+# Both accept raw bytes, so the output doesn't need to be decoded first.
+json_loads = orjson.loads if orjson else json.loads
+
+# Number of threads used to read file details (os.stat) in parallel.
+# Stat calls mostly wait on storage latency, not the CPU, so this is larger than the core count.
+STAT_WORKERS = 32
+# Number of threads used to rename cover art in parallel; renames also wait on storage, not the CPU.
+RENAME_WORKERS = 32
+
+# Maximum number of bytes of FFmpeg error output kept per file.
+# A badly damaged file can log an error for every frame; the first errors are enough to report it.
+ERROR_OUTPUT_LIMIT = 64 * 1024
+
+# Check if the system can be asked to read files ahead (posix_fadvise is not available on Windows or macOS).
+CAN_PREFETCH = hasattr(os, "posix_fadvise")
+
+# Minimum time in seconds between two redraws of the progress bar.
+# Redrawing after every file would make terminal output the bottleneck for fast tasks.
+PROGRESS_MIN_INTERVAL = 0.1
+# Time of the last progress bar redraw, used to throttle updates.
+_last_progress_update = 0.0
+# Fixed length of the progress bar, in characters.
+PROGRESS_BAR_LENGTH = 70
+# Completely filled and completely empty bars; each redraw joins a slice of both.
+PROGRESS_BAR_FILLED = '#' * PROGRESS_BAR_LENGTH
+PROGRESS_BAR_EMPTY = '-' * PROGRESS_BAR_LENGTH
+# Check if progress goes to a terminal; if not (e.g. redirected to a file), only milestones are written.
+PROGRESS_IS_TTY = sys.stderr.isatty()
+# Number of milestones written when progress does not go to a terminal (every 10%).
+PROGRESS_MILESTONES = 10
+
 # Function to display a simple ASCII progress bar in the terminal.
 def print_progress_bar(current: int, total: int, task_name: str = ''):
     """Displays a simple ASCII progress bar in the terminal."""
-    # Set the fixed length of the progress bar to 70 characters.
-    BAR_LENGTH = 70
+    global _last_progress_update
+    # Without a terminal, '\r' can't redraw the line, so write a plain line at the start, each milestone and the end.
+    if not PROGRESS_IS_TTY:
+        if current == 0 or current >= total or current * PROGRESS_MILESTONES // total != (current - 1) * PROGRESS_MILESTONES // total:
+            sys.stderr.write(f'{task_name}: {current * 100 // total if total > 0 else 100}% {current}/{total}\n')
+        return
+    # Skip the redraw if the bar was drawn very recently, unless the task is starting or complete.
+    now = time.monotonic()
+    if 0 < current < total and now - _last_progress_update < PROGRESS_MIN_INTERVAL:
+        return
+    _last_progress_update = now
     # Calculate the percentage completed, avoiding division by zero.
     percentage = (current / total) * 100 if total > 0 else 100
     # Calculate how many bar segments should be filled based on progress.
-    filled = int(BAR_LENGTH * current // total) if total > 0 else BAR_LENGTH
-    # Create the bar string: '#' for completed, '-' for remaining.
-    bar = '#' * filled + '-' * (BAR_LENGTH - filled)
-    # Print the progress bar with task name, bar, percentage, and current/total count.
-    # '\r' returns the cursor to the start of the line for overwriting, 'flush=True' ensures immediate display.
-    print(f'\r{task_name} [{bar}] {int(percentage)}% {current}/{total}', end='', flush=True)
-    # If the task is complete, add a newline to finalize the output.
-    if current == total:
-        print()
+    filled = int(PROGRESS_BAR_LENGTH * current // total) if total > 0 else PROGRESS_BAR_LENGTH
+    # Create the bar string from the precomputed bars: '#' for completed, '-' for remaining.
+    bar = PROGRESS_BAR_FILLED[:filled] + PROGRESS_BAR_EMPTY[filled:]
+    # Write the progress bar with task name, bar, percentage, and current/total count to stderr, like tqdm,
+    # so it stays out of results printed or redirected on stdout. '\r' returns the cursor to the start of
+    # the line for overwriting; if the task is complete, a newline finalizes the output.
+    sys.stderr.write(f'\r{task_name} [{bar}] {int(percentage)}% {current}/{total}' + ('\n' if current == total else ''))
+    # Flush to ensure immediate display.
+    sys.stderr.flush()
 
 # Custom argparse type function to validate that a path is a directory.
 def directory_path(path: str) -> str:
@@ -59,40 +150,200 @@ def path_type(path: str) -> str:
     # Raise an error with a descriptive message if the path does not exist.
     raise argparse.ArgumentTypeError(f"'{path}' does not exist")
 
+# Custom argparse type function to validate a positive worker count.
+def positive_int(value: str) -> int:
+    """Validates that a value is a positive integer."""
+    # Check if the value is made of digits and is at least 1.
+    if value.isdigit() and int(value) >= 1:
+        # Return the converted number if valid.
+        return int(value)
+    # Raise an error with a descriptive message if the value is not a positive integer.
+    raise argparse.ArgumentTypeError(f"'{value}' is not a positive integer")
+
+# Function to recursively yield every file in a directory tree.
+def iter_files(directory: str) -> Iterator[os.DirEntry]:
+    """Recursively yields a DirEntry for each file in a directory."""
+    # Keep a stack of directories still to be scanned instead of recursing.
+    stack = [directory]
+    while stack:
+        # Collect the subdirectories of the current directory while scanning it.
+        subdirectories = []
+        try:
+            # os.scandir returns each entry's type along with its name, so no extra stat calls are needed.
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    # Remember subdirectories for later. As in os.walk, symlinks to directories count as
+                    # directories but aren't followed; only a symlink needs a stat call to tell.
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            subdirectories.append(entry.path)
+                    else:
+                        yield entry
+        except OSError:
+            # Skip directories that can't be read, as os.walk does.
+            pass
+        # Push subdirectories in reverse, so they are scanned in listing order like os.walk.
+        stack.extend(reversed(subdirectories))
+
+# Function to check whether a file name or path has a supported audio extension.
+def has_audio_extension(file_name: str) -> bool:
+    """Checks if a file name ends with one of the AUDIO_EXTENSIONS."""
+    # Find the last dot directly rather than splitting the name, which allocates a tuple per file.
+    dot = file_name.rfind('.')
+    # Compare the lowercased extension (including the dot) against AUDIO_EXTENSIONS.
+    return dot != -1 and file_name[dot:].lower() in AUDIO_EXTENSIONS
+
 # Function to recursively find all audio files in a directory.
-def get_audio_files(directory: str) -> List[str]:
+def get_audio_files(directory: str) -> Iterator[str]:
     """Recursively finds all audio files in a directory."""
-    # Initialize an empty list to store paths of audio files.
-    audio_files = []
-    # Use os.walk to iterate over the directory tree (root, subdirs, files).
-    for root, _, files in os.walk(directory):
-        # Iterate over each file in the current directory.
-        for file in files:
-            # Split the file into name and extension, and convert extension to lowercase.
-            # Check if the extension matches any in AUDIO_EXTENSIONS.
-            if os.path.splitext(file)[1].lower() in AUDIO_EXTENSIONS:
-                # Construct the full path and append it to the list.
-                audio_files.append(os.path.join(root, file))
-    # Return the list of audio file paths.
-    return audio_files
+    # Walk the directory tree in a single pass.
+    for entry in iter_files(directory):
+        # Check if the file name ends with an extension in AUDIO_EXTENSIONS.
+        if has_audio_extension(entry.name):
+            # Yield the full path of the audio file.
+            yield entry.path
+
+# Function to find the audio files to process for a file or directory path.
+def find_audio_files(path: str) -> list:
+    """Returns the audio files for a path, or an empty list after printing why there are none."""
+    # If the path is a file, check if it’s an audio file by extension.
+    if os.path.isfile(path):
+        if has_audio_extension(path):
+            return [path]
+        # Print an error if it’s not a supported audio file.
+        print(f"'{path}' is not a supported audio file.")
+    elif os.path.isdir(path):
+        # If the path is a directory, get all audio files recursively.
+        audio_files = list(get_audio_files(path))
+        if audio_files:
+            return audio_files
+        # If no audio files are found, print a message.
+        print(f"No audio files found in '{path}'.")
+    else:
+        # If the path is neither a file nor directory, print an error.
+        print(f"'{path}' is not a file or directory.")
+    return []
+
+# Function to decode an audio file (or a part of it) with FFmpeg and return any error output.
+def run_ffmpeg_decode(file_path: str, input_options: Tuple[str, ...] = (), output_options: Tuple[str, ...] = (), first_error: bool = False) -> str:
+    """Decodes an audio file with FFmpeg and returns its error output."""
+    # Run FFmpeg with the fixed FFMPEG_ARGS, the input file (-i file_path) and the given options.
+    # Output to null format (-f null) and discard (-).
+    # Only stderr is captured, as raw bytes, since the null output never writes to stdout.
+    # stdin is closed as well, so the child never inherits the terminal from a worker thread.
+    process = subprocess.Popen(
+        [*FFMPEG_ARGS, *input_options, '-i', file_path, *output_options, *FFMPEG_NULL_OUTPUT],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    try:
+        truncated = False
+        if first_error:
+            # Read only the first error line; a single error fails the file, so stop FFmpeg as soon as it appears.
+            error_output = process.stderr.readline(ERROR_OUTPUT_LIMIT)
+            if error_output:
+                process.kill()
+        else:
+            # Keep at most ERROR_OUTPUT_LIMIT bytes of error output; for a valid file this reads nothing until EOF.
+            error_output = process.stderr.read(ERROR_OUTPUT_LIMIT)
+            # Read and discard the rest, so FFmpeg never blocks on a full pipe, and note whether anything was cut.
+            while process.stderr.read(ERROR_OUTPUT_LIMIT):
+                truncated = True
+    finally:
+        # Close the pipe and wait for FFmpeg to exit, even if reading failed.
+        process.stderr.close()
+        process.wait()
+    # A valid file produces no error output, and there is nothing to decode.
+    if not error_output:
+        return ""
+    # If the output was cut, drop the partial last line (unless it is the only line) and say that more errors followed.
+    if truncated:
+        last_newline = error_output.rfind(b"\n")
+        if last_newline != -1:
+            error_output = error_output[:last_newline + 1]
+        else:
+            error_output += b"\n"
+        error_output += b"[further errors omitted]"
+    # Decode the error output and return it stripped.
+    return error_output.decode('utf-8', 'replace').strip()
 
 # Function to check the integrity of an audio file using FFmpeg.
-def check_file_integrity(file_path: str) -> Tuple[str, str]:
-    """Uses FFmpeg to check audio file integrity."""
+def check_file_integrity(
+    file_path: str,
+    quick: bool = False,
+    threads: int = 0,
+    first_error: bool = False,
+) -> Union[Tuple[str, str], Exception]:
+    """Uses FFmpeg to check audio file integrity, returning the exception if it can't run."""
     try:
-        # Run FFmpeg in error-only mode (-v error) with the input file (-i file_path).
-        # Output to null format (-f null) and discard (-), capturing output as text.
-        result = subprocess.run(
-            ['ffmpeg', '-v', 'error', '-i', file_path, '-f', 'null', '-'],
-            capture_output=True, text=True
-        )
-        # If no error output (stderr), the file is valid; return "PASSED" with empty message.
-        # Otherwise, return "FAILED" with the stripped error message.
-        return ("PASSED", "") if not result.stderr else ("FAILED", result.stderr.strip())
+        # Set the number of FFmpeg decoding threads (0 lets FFmpeg choose).
+        thread_options = ('-threads', str(threads))
+        # In quick mode, decode only the first second (-t 1) and then the last second (-sseof -1).
+        # Truncated or damaged files usually fail at one of the ends, for a fraction of a full decode.
+        if quick:
+            message = run_ffmpeg_decode(file_path, input_options=thread_options, output_options=('-t', '1'), first_error=first_error)
+            # Decode the last second only if the first one had no errors.
+            if not message:
+                message = run_ffmpeg_decode(file_path, input_options=(*thread_options, '-sseof', '-1'), first_error=first_error)
+        # If the flac tool is available, test FLAC files with it instead of a full FFmpeg decode.
+        elif FLAC_BIN and os.path.splitext(file_path)[1].lower() == ".flac":
+            # Run flac in test mode, with no stdin, discarding stdout and capturing stderr as bytes.
+            result = subprocess.run([*FLAC_TEST_ARGS, file_path], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            # A zero exit code means the file decoded and its MD5 signature matched.
+            if result.returncode == 0:
+                return ("PASSED", "")
+            # Otherwise, return "FAILED" with the decoded error message, or the exit code if there is none.
+            return ("FAILED", result.stderr.decode('utf-8', 'replace').strip() or f"flac exited with code {result.returncode}")
+        # Otherwise, decode the whole file with FFmpeg.
+        else:
+            message = run_ffmpeg_decode(file_path, input_options=thread_options, first_error=first_error)
+        # If there is no error output, the file is valid; return "PASSED" with empty message.
+        # Otherwise, return "FAILED" with the error message.
+        return ("PASSED", "") if not message else ("FAILED", message)
     except Exception as e:
-        # If an exception occurs (e.g., FFmpeg not found), return "FAILED" with the exception message.
+        # If the check can't run (e.g., FFmpeg not found), return the exception instead of a verdict,
+        # so it is reported as a failure but not cached.
+        return e
+
+# Function to check the integrity of an audio file by decoding it in-process with PyAV.
+def check_file_integrity_in_process(file_path: str) -> Union[Tuple[str, str], Exception]:
+    """Uses PyAV to check audio file integrity without launching FFmpeg, returning the exception if the file can't be read."""
+    try:
+        # Capture the error messages libav logs in this thread, like 'ffmpeg -v error' prints them.
+        with av.logging.Capture(local=True) as logs:
+            # Open the file and decode every frame of its first audio stream.
+            with av.open(file_path) as container:
+                for _ in container.decode(audio=0):
+                    pass
+        # Keep the messages logged at error level or worse.
+        errors = [message.strip() for level, _, message in logs if level <= av.logging.ERROR]
+        # If nothing was logged, the file is valid; otherwise, return "FAILED" with the messages.
+        return ("PASSED", "") if not errors else ("FAILED", "\n".join(errors))
+    except OSError as e:
+        # If the file can't be read (e.g., missing or too many open files), return the exception instead of a verdict.
+        return e
+    except Exception as e:
+        # If decoding fails (e.g., corrupt data), return "FAILED" with the exception message.
         return ("FAILED", str(e))
 
+# Function to check the structure of an audio file with ffprobe, without decoding it.
+def check_file_structure(file_path: str) -> Union[Tuple[str, str], Exception]:
+    """Uses ffprobe to check that an audio file can be opened and parsed, returning the exception if ffprobe can't run."""
+    try:
+        # Run ffprobe with no stdin, capturing the JSON error report (stdout) and log messages (stderr) as bytes.
+        result = subprocess.run([*FFPROBE_ERROR_ARGS, file_path], stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        # Decode the log messages only if there are any.
+        message = result.stderr.decode('utf-8', 'replace').strip() if result.stderr else ""
+        # With no error exit code and no messages, the container and stream headers are valid.
+        if result.returncode == 0 and not message:
+            return ("PASSED", "")
+        # Otherwise, return "FAILED" with the messages, the error string from the report, or the exit code.
+        if not message:
+            message = json_loads(result.stdout).get("error", {}).get("string", "") if result.stdout.strip() else ""
+        return ("FAILED", message or f"ffprobe exited with code {result.returncode}")
+    except Exception as e:
+        # If the check can't run (e.g., ffprobe not found or an unreadable report), return the exception instead of a verdict.
+        return e
+
 # Function to load or create the configuration file.
 def load_config():
     """Loads or creates the config file."""
@@ -110,34 +361,156 @@ def load_config():
         # Return the default config.
         return default_config
 
+# Function to read the details that tell whether a file changed since it was last checked.
+def file_signature(file_path: str):
+    """Returns the modification time and size of a file, or None if it can't be read."""
+    try:
+        # Read the file status once and keep the nanosecond modification time and size.
+        stat = os.stat(file_path)
+        return [stat.st_mtime_ns, stat.st_size]
+    except OSError:
+        # If the file can't be read, it has no signature and is never taken from the cache.
+        return None
+
+# Function to read the signatures of many files at once.
+def file_signatures(files) -> list:
+    """Returns the signature of each file, in order."""
+    # The stat calls run in a thread pool so many are in flight at once on slow or network storage.
+    with ThreadPoolExecutor(max_workers=STAT_WORKERS) as stat_executor:
+        return list(stat_executor.map(file_signature, files))
+
+# Function to load a cache of earlier results (integrity checks or ffprobe metadata).
+def load_cache(cache_file: Path) -> dict:
+    """Loads a JSON cache file."""
+    # Check if the cache file exists.
+    if cache_file.exists():
+        try:
+            # Open the file in read mode and load its JSON contents.
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # Ignore an unreadable or corrupt cache; it is replaced on the next save.
+            pass
+    # Return an empty cache if there is no usable cache file.
+    return {}
+
+# Function to save a cache of results.
+def save_cache(cache_file: Path, cache: dict):
+    """Saves a JSON cache file."""
+    # Create the cache folder if it doesn’t exist, including parent directories.
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a temporary file first and then replace the cache, so an interrupted save can't corrupt it.
+    temp_file = cache_file.with_name(cache_file.name + ".tmp")
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+    os.replace(temp_file, cache_file)
+
+# Function to load the results recorded in an earlier JSONL integrity log.
+def load_resume_log(resume_file: str) -> dict:
+    """Loads the results of an earlier JSONL log, keyed by absolute path."""
+    # Initialize an empty dictionary for the recorded results.
+    results = {}
+    # Open the log in read mode and parse it one record per line.
+    with open(resume_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json_loads(line)
+                # Accept only records with a known status and a message, so a resumed result can be used as is.
+                if record["status"] not in ("PASSED", "FAILED") or not isinstance(record["message"], str):
+                    raise ValueError("malformed record")
+                results[os.path.abspath(record["path"])] = record
+            except (ValueError, TypeError, KeyError):
+                # Skip blank or malformed lines, such as a partial last line from an interrupted run.
+                continue
+    return results
+
+# Function to look up the cached integrity result of a file.
+def get_cached_result(cache: dict, file_path: str, signature, mode: str = "full"):
+    """Returns the cached result of a file if it hasn't changed since, else None."""
+    # Look up the entry by absolute path, so the same file matches from any working directory.
+    entry = cache.get(os.path.abspath(file_path))
+    # Use the entry only if the file still has the same modification time and size.
+    # Results of full FFmpeg checks are reused by every mode; results of quick, fast or in-process checks only by the same mode,
+    # so a verdict from PyAV's bundled decoder never stands in for FFmpeg's.
+    if signature and entry and entry.get("signature") == signature and entry.get("mode") in ("full", mode):
+        return entry["status"], entry["message"]
+    return None
+
+# Function to ask the kernel to start reading a file before it is needed.
+def prefetch_file(file_path: str):
+    """Starts reading a file into the page cache in the background."""
+    try:
+        # Open the file, hint that it will be read soon (the kernel starts readahead and returns at once), and close it.
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+    except OSError:
+        # Prefetching is only a hint; the check itself reports unreadable files.
+        pass
+
+# Function to check one file of a list while prefetching a later one.
+def check_with_prefetch(check, files: list, ahead: int, index: int) -> Union[Tuple[str, str], Exception]:
+    """Checks files[index] after starting readahead of files[index + ahead]."""
+    # Prefetch the file that starts once the files now being decoded are done, so its reads overlap their decoding.
+    if index + ahead < len(files):
+        prefetch_file(files[index + ahead])
+    # Run the check on the file itself.
+    return check(files[index])
+
+# Function to format the log entry of a checked file.
+def format_log_entry(file_path: str, status: str, message: str, mode: str, log_format: str) -> str:
+    """Returns the log line of a result, as text or as a JSON record."""
+    # JSON records hold the absolute path, so the log can be resumed from any working directory.
+    if log_format == "jsonl":
+        record = {"path": os.path.abspath(file_path), "status": status, "message": message, "mode": mode}
+        return json.dumps(record, ensure_ascii=False) + "\n"
+    # Text lines hold the status, the file path and an optional error message.
+    return f"{status} {file_path}" + (f": {message}" if message else "") + "\n"
+
 # Function to check the integrity of audio files in the given path.
-def check_integrity(path: str, verbose: bool = False, summary: bool = False, save_log: bool = False, log_folder: Path = Path("Logs")):
+def check_integrity(
+    path: str,
+    verbose: bool = False,
+    summary: bool = False,
+    save_log: bool = False,
+    log_folder: Path = Path("Logs"),
+    jobs: int = None,
+    in_process: bool = False,
+    quick: bool = False,
+    fast: bool = False,
+    log_format: str = "text",
+    resume: str = None,
+    audio_files: list = None,
+    force: bool = False,
+    first_error: bool = False,
+):
     """Checks integrity of audio files."""
-    # Check if FFmpeg is available in the system’s PATH.
-    if not shutil.which('ffmpeg'):
+    # For in-process checks, make sure PyAV is installed and enable its error logging.
+    if in_process:
+        if av is None:
+            # Print an error and exit if PyAV is not found.
+            print("Error: PyAV is not installed (pip install av).")
+            return
+        av.logging.set_level(av.logging.ERROR)
+    # For fast checks, check if ffprobe is available in the system’s PATH.
+    elif fast:
+        if not FFPROBE_BIN:
+            # Print an error and exit if ffprobe is not found.
+            print("Error: ffprobe is not installed or not in your PATH.")
+            return
+    # Otherwise, check if FFmpeg is available in the system’s PATH.
+    elif not FFMPEG_BIN:
         # Print an error and exit if FFmpeg is not found.
         print("Error: FFmpeg is not installed or not in your PATH.")
         return
 
-    # Determine the list of audio files to process based on the input path.
-    if os.path.isfile(path):
-        # If the path is a file, check if it’s an audio file by extension.
-        if os.path.splitext(path)[1].lower() in AUDIO_EXTENSIONS:
-            audio_files = [path]
-        else:
-            # Print an error and exit if it’s not a supported audio file.
-            print(f"'{path}' is not a supported audio file.")
-            return
-    elif os.path.isdir(path):
-        # If the path is a directory, get all audio files recursively.
-        audio_files = get_audio_files(path)
-        # If no audio files are found, print a message and exit.
-        if not audio_files:
-            print(f"No audio files found in '{path}'.")
-            return
-    else:
-        # If the path is neither a file nor directory, print an error and exit.
-        print(f"'{path}' is not a file or directory.")
+    # Determine the list of audio files to process based on the input path, unless it was already found.
+    if audio_files is None:
+        audio_files = find_audio_files(path)
+    # Exit if there is nothing to process; find_audio_files has printed why.
+    if not audio_files:
         return
 
     # Decide whether to create a log file: if save_log is True or neither verbose nor summary is set.
@@ -146,14 +519,12 @@ def check_integrity(path: str, verbose: bool = False, summary: bool = False, sav
     if create_log:
         # Create the log folder if it doesn’t exist, including parent directories.
         log_folder.mkdir(parents=True, exist_ok=True)
-        # Generate a unique log filename with a timestamp.
-        log_filename = log_folder / f"integrity_check_log_{datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.txt"
-        # Open the log file in write mode with UTF-8 encoding.
-        log_file = open(log_filename, 'w', encoding='utf-8')
-
-    # Initialize counters for passed and failed files.
-    passed_count = 0
-    failed_count = 0
+        # Generate a unique log filename with a timestamp, and an extension matching the log format.
+        log_filename = log_folder / f"integrity_check_log_{datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.{'jsonl' if log_format == 'jsonl' else 'txt'}"
+        # Open the log file in write mode with UTF-8 encoding and a 1 MiB buffer,
+        # so the per-file result lines reach the disk in a few large writes.
+        log_file = open(log_filename, 'w', encoding='utf-8', buffering=1 << 20)
+
     # Get the total number of files to process.
     total_files = len(audio_files)
 
@@ -161,29 +532,126 @@ def check_integrity(path: str, verbose: bool = False, summary: bool = False, sav
     if not verbose:
         print_progress_bar(0, total_files, "Checking files")
 
-    # Iterate over each audio file with its index for progress tracking.
-    for index, file_path in enumerate(audio_files):
-        # Check the file’s integrity using FFmpeg.
-        status, message = check_file_integrity(file_path)
-        # Construct the result string: status, file path, and optional error message.
-        result_line = f"{status} {file_path}" + (f": {message}" if message else "")
-
-        # If verbose mode is enabled, print the result immediately.
-        if verbose:
-            print(result_line)
-        # If logging is enabled, write the result to the log file.
-        if create_log:
-            log_file.write(result_line + "\n")
-
-        # Increment the appropriate counter based on the status.
-        if status == "PASSED":
-            passed_count += 1
+    # Name the check mode, which is stored with each result.
+    mode = "in-process" if in_process else "fast" if fast else "quick" if quick else "full"
+    # Load the results of earlier runs, so files that haven't changed are not decoded again.
+    cache_file = log_folder / "integrity_cache.json"
+    cache = load_cache(cache_file)
+    # Read the modification time and size of each file, which decide whether its cached result is valid.
+    signatures = file_signatures(audio_files)
+    # Load the results recorded by the interrupted run that is being resumed, if any.
+    resumed = load_resume_log(resume) if resume else {}
+    # Collect the cached or resumed result of each file, or None if it has to be checked with FFmpeg.
+    # As with the cache, results of quick, fast or in-process checks are only reused by the same mode.
+    cached_results = []
+    for file_path, signature in zip(audio_files, signatures):
+        # With force, cached results are ignored (and replaced by the new results).
+        cached = None if force else get_cached_result(cache, file_path, signature, mode)
+        record = resumed.get(os.path.abspath(file_path))
+        if cached is None and record and record.get("mode") in ("full", mode):
+            cached = record["status"], record["message"]
+        cached_results.append(cached)
+    # Make the list of the files that have to be checked, by their place in the file order.
+    pending_indexes = [index for index, cached in enumerate(cached_results) if cached is None]
+    # Decoding time grows with file size, so full checks hand the largest files to the pool first (sizes come from the signatures).
+    # Otherwise a long file picked up last would keep one worker busy while the others sit idle.
+    # Quick and fast checks cost about the same for every file, and keep the file order.
+    if mode in ("full", "in-process"):
+        pending_indexes.sort(key=lambda index: signatures[index][1] if signatures[index] else 0, reverse=True)
+    # Make the list of files that have to be checked, in the order they are handed to the pool.
+    pending_files = [audio_files[index] for index in pending_indexes]
+    # Collect the result of each file at its place in the file order; cached and resumed results are known from the start,
+    # the others are filled in as their checks finish.
+    results = list(cached_results)
+    # Place in the file order of the next result to write to the log (and print in verbose mode).
+    next_to_write = 0
+
+    # Function to write the results that are known, in file order, up to the first file that is still being checked.
+    def write_ready_results():
+        """Writes the known results that follow the ones already written."""
+        nonlocal next_to_write
+        while next_to_write < total_files and results[next_to_write] is not None:
+            file_path = audio_files[next_to_write]
+            status, message = results[next_to_write]
+            # If verbose mode is enabled, print the result.
+            if verbose:
+                print(f"{status} {file_path}" + (f": {message}" if message else ""))
+            # If logging is enabled, write the result to the log file, as text or as one JSON record per line.
+            # Resumed results are written again, so the new log is complete and can be resumed in turn.
+            if create_log:
+                log_file.write(format_log_entry(file_path, status, message, mode, log_format))
+            next_to_write += 1
+
+    # Run the checks in a thread pool: each check is a separate FFmpeg process, so threads
+    # are enough to keep every CPU core busy. Results are processed here, in the main thread.
+    workers = jobs or os.cpu_count()
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        # Each worker either decodes with PyAV in this process, launches ffprobe (fast mode) or launches FFmpeg.
+        if in_process:
+            check = check_file_integrity_in_process
+        elif fast:
+            check = check_file_structure
         else:
-            failed_count += 1
-
-        # If not in verbose mode, update the progress bar.
-        if not verbose:
-            print_progress_bar(index + 1, total_files, "Checking files")
+            # When several files are decoded at once, each FFmpeg gets a single thread, so the pool
+            # doesn't start one thread per core in every process; a lone file may use all cores.
+            threads = 1 if min(workers, len(pending_files)) > 1 else 0
+            check = partial(check_file_integrity, quick=quick, threads=threads, first_error=first_error)
+        # Full checks read each whole file, so read ahead the next files (in dispatch order) on systems that support it.
+        # Quick and fast checks read only a small part of each file, and nothing is prefetched for them.
+        prefetch = mode in ("full", "in-process") and CAN_PREFETCH
+        # Submit the checks in dispatch order, remembering each check's place in the file order.
+        futures = {}
+        for position, index in enumerate(pending_indexes):
+            if prefetch:
+                futures[executor.submit(check_with_prefetch, check, pending_files, workers, position)] = index
+            else:
+                futures[executor.submit(check, pending_files[position])] = index
+
+        # Number of files with a known result, for the progress bar.
+        done_count = total_files - len(pending_files)
+        # Write the results known from the start, and show them in the progress bar.
+        write_ready_results()
+        if not verbose and done_count:
+            print_progress_bar(done_count, total_files, "Checking files")
+        # Handle each check as it finishes.
+        for future in as_completed(futures):
+            # Take the result and its file, in the order the checks finish.
+            index = futures[future]
+            result = future.result()
+            # A check that couldn't run returns its exception: report it as a failure, but don't cache it,
+            # so the file is checked again on the next run.
+            if isinstance(result, Exception):
+                result = ("FAILED", str(result))
+            # Remember a new result right away, so the file is skipped next time if it stays unchanged,
+            # even if the run is interrupted before the result's turn in the log.
+            elif signatures[index]:
+                status, message = result
+                entry = {"signature": signatures[index], "status": status, "message": message, "mode": mode}
+                cache[os.path.abspath(audio_files[index])] = entry
+            results[index] = result
+            # Write the results that are now ready in file order, and update the progress bar if not in verbose mode.
+            write_ready_results()
+            done_count += 1
+            if not verbose:
+                print_progress_bar(done_count, total_files, "Checking files")
+    finally:
+        # Cancel queued checks instead of waiting for them (e.g. after Ctrl+C).
+        executor.shutdown(cancel_futures=True)
+        # Save the cache, including the results collected before an interruption.
+        save_cache(cache_file, cache)
+        if log_file:
+            # After an interruption, also log the results that finished ahead of their turn (out of file order),
+            # so the log holds every finished check and can be resumed from.
+            for file_path, result in zip(audio_files[next_to_write:], results[next_to_write:]):
+                if result is not None:
+                    log_file.write(format_log_entry(file_path, result[0], result[1], mode, log_format))
+            # Flush the log as well, so an interrupted run leaves a complete log to resume from.
+            log_file.flush()
+
+    # Count the passed and failed files.
+    passed_count = sum(1 for status, _ in results if status == "PASSED")
+    failed_count = total_files - passed_count
 
     # Create a summary string with total, passed, and failed counts.
     summary_text = f"\nSummary:\nTotal files: {total_files}\nPassed: {passed_count}\nFailed: {failed_count}\n"
@@ -191,8 +659,10 @@ def check_integrity(path: str, verbose: bool = False, summary: bool = False, sav
     if verbose or summary:
         print(summary_text)
     # If logging, write the summary to the log file and close it.
+    # JSONL logs hold only result records, so the summary is left out of them.
     if create_log:
-        log_file.write(summary_text)
+        if log_format != "jsonl":
+            log_file.write(summary_text)
         log_file.close()
         # Inform the user where the log was saved.
         print(f"Check complete. Log saved to '{log_filename}'")
@@ -201,22 +671,23 @@ def check_integrity(path: str, verbose: bool = False, summary: bool = False, sav
         print("Check complete.")
 
 # Function to rename cover art files to hide or show them.
-def rename_cover_art(file_path: str, hide: bool):
+def rename_cover_art(file_path: str, file_name: str, hide: bool):
     """Renames cover art files to hide or show."""
-    # Extract the file name and directory from the full path.
-    file_name = os.path.basename(file_path)
-    directory = os.path.dirname(file_path)
+    # Take the directory part (with its trailing separator) from the path, using the name known from the scan.
+    directory = file_path[:len(file_path) - len(file_name)]
+    # Compare the name in lowercase, so files like 'Cover.JPG' are recognized too.
+    lower_name = file_name.lower()
     # If hiding and the file is a standard cover art file...
-    if hide and file_name in ["cover.jpg", "cover.jpeg", "cover.png"]:
+    if hide and lower_name in COVER_NAMES:
         # Create a new hidden file name by adding a dot prefix.
-        new_name = os.path.join(directory, "." + file_name)
+        new_name = directory + "." + file_name
         # Rename the file if the new name doesn’t already exist.
         if not os.path.exists(new_name):
             os.rename(file_path, new_name)
     # If showing and the file is a hidden cover art file...
-    elif not hide and file_name in [".cover.jpg", ".cover.jpeg", ".cover.png"]:
+    elif not hide and lower_name in HIDDEN_COVER_NAMES:
         # Create a new visible file name by removing the dot prefix.
-        new_name = os.path.join(directory, file_name[1:])
+        new_name = directory + file_name[1:]
         # Rename the file if the new name doesn’t already exist.
         if not os.path.exists(new_name):
             os.rename(file_path, new_name)
@@ -224,56 +695,135 @@ def rename_cover_art(file_path: str, hide: bool):
 # Function to process cover art files in a directory.
 def process_cover_art(path: str, hide: bool):
     """Processes cover art files in a directory."""
-    # Calculate the total number of files in the directory tree.
-    total_files = sum(len(files) for _, _, files in os.walk(path))
-    # If no files are found, print a message and exit.
+    # Pick the names to rename: visible cover art when hiding, hidden cover art when showing.
+    target_names = COVER_NAMES if hide else HIDDEN_COVER_NAMES
+    # Collect the cover art files in the directory tree in a single scan; all other files are skipped.
+    # The directory entries are kept, so each file's name doesn't have to be split from its path again.
+    cover_files = [entry for entry in iter_files(path) if entry.name.lower() in target_names]
+    # Get the total number of files to process.
+    total_files = len(cover_files)
+    # If no cover art files are found, print a message and exit.
     if total_files == 0:
-        print(f"No files found in '{path}' to process.")
+        print(f"No cover art files found in '{path}' to process.")
         return
 
-    # Initialize a counter for processed files.
-    processed = 0
     # Initialize the progress bar at 0.
-    print_progress_bar(processed, total_files, "Processing cover art")
-    # Walk through the directory tree.
-    for root, _, files in os.walk(path):
-        # Process each file in the current directory.
-        for file in files:
-            # Attempt to rename the file if it’s a cover art file.
-            rename_cover_art(os.path.join(root, file), hide)
-            # Increment the processed counter.
-            processed += 1
-            # Update the progress bar.
-            print_progress_bar(processed, total_files, "Processing cover art")
+    print_progress_bar(0, total_files, "Processing cover art")
+    # Rename the files in a thread pool, so renames on slow or network storage overlap.
+    executor = ThreadPoolExecutor(max_workers=RENAME_WORKERS)
+    try:
+        # executor.map takes the path and name of each file; iterating it waits for each rename in order
+        # and raises any error, as a plain loop would.
+        renames = executor.map(partial(rename_cover_art, hide=hide), [entry.path for entry in cover_files], [entry.name for entry in cover_files])
+        # Update the progress bar as each rename finishes, with its index for progress tracking.
+        for index, _ in enumerate(renames):
+            print_progress_bar(index + 1, total_files, "Processing cover art")
+    finally:
+        # Cancel queued renames instead of waiting for them (e.g. after Ctrl+C).
+        executor.shutdown(cancel_futures=True)
+
+# Function to read the metadata of a single audio file using ffprobe.
+def probe_audio_file(audio_file: str) -> dict:
+    """Reads audio file metadata with ffprobe, returning the exception on failure."""
+    try:
+        # Run ffprobe to get the metadata fields used in the report, suppressing verbose output.
+        # The exit code is checked only if no metadata was printed, so fields read before an error are still used.
+        cmd = [*FFPROBE_ARGS, audio_file]
+        result = subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE)
+        # Split the "key=value" lines into a dictionary; ffprobe prints "N/A" for values it doesn't know.
+        fields = dict(line.split("=", 1) for line in result.stdout.decode('utf-8', 'replace').splitlines() if "=" in line)
+        # Without a codec name, there is nothing to report: either ffprobe failed or the file has no audio stream.
+        if "codec_name" not in fields:
+            raise ValueError(f"ffprobe exited with code {result.returncode}" if result.returncode else "no audio stream found")
+        # Read the channel count as a number, as the report compares it with 1 and 2.
+        channels = fields.get("channels", "N/A")
+        # Keep only the metadata fields used in the report, defaulting to "N/A" if not present.
+        return {
+            "codec_name": fields["codec_name"],
+            "sample_rate": fields.get("sample_rate", "N/A"),
+            "channels": int(channels) if channels.isdigit() else channels,
+            "bits_per_raw_sample": fields.get("bits_per_raw_sample", "N/A"),
+            "bit_rate": fields.get("bit_rate", "N/A"),
+        }
+    except Exception as e:
+        # Return the exception instead of raising it, so it is reported along with the other results.
+        return e
+
+# Function to look up the cached metadata of a file.
+def get_cached_info(cache: dict, audio_file: str, signature):
+    """Returns the cached metadata of a file if it hasn't changed since, else None."""
+    # Look up the entry by absolute path and use it only if the modification time and size still match.
+    entry = cache.get(os.path.abspath(audio_file))
+    if signature and entry and entry.get("signature") == signature:
+        return entry["info"]
+    return None
+
+# Function to write the metadata report of a single audio file to the output stream.
+def write_audio_info(audio_file: str, info, output_stream):
+    """Writes the metadata report of an audio file."""
+    # Collect the report lines first, so each file's report takes a single write.
+    # Start with the file being analyzed.
+    lines = [f"Analyzing: {audio_file}\n"]
+    # If probing failed, add an error message.
+    if isinstance(info, Exception):
+        lines.append(f"  [ERROR] Failed to analyze: {info}\n")
+        output_stream.write("".join(lines))
+        return
+    try:
+        # Extract the metadata fields.
+        codec = info["codec_name"]
+        sample_rate = info["sample_rate"]
+        channels = info["channels"]
+        bit_depth = info["bits_per_raw_sample"]
+        bit_rate = info["bit_rate"]
+
+        # Determine channel information based on the number of channels.
+        channel_info = CHANNEL_NAMES.get(channels, f"{channels} channels")
+        # Add the metadata lines, formatting units appropriately.
+        lines.append(
+            f"  Bitrate: {f'{bit_rate} bps' if bit_rate != 'N/A' else 'N/A'}\n"
+            f"  Sample Rate: {f'{sample_rate} Hz' if sample_rate != 'N/A' else 'N/A'}\n"
+            f"  Bit Depth: {f'{bit_depth} bits' if bit_depth != 'N/A' else 'N/A'}\n"
+            f"  Channels: {channel_info}\n"
+            f"  Codec: {codec}\n"
+        )
+
+        # Get the lowercased extension once for the codec notes.
+        suffix = os.path.splitext(audio_file)[1].lower()
+        # Add codec-specific information for .m4a files, warning about codecs not in M4A_CODEC_NOTES.
+        if suffix == ".m4a":
+            lines.append(M4A_CODEC_NOTES.get(codec.lower(), f"  [WARNING] Unknown codec: {codec}\n"))
+        # Note lossy codecs for .opus and .mp3 files.
+        elif suffix in LOSSY_EXTENSIONS:
+            lines.append(f"  [INFO] Lossy codec: {codec}\n")
+        # Warn if bit depth is less than 16, suggesting possible lossy encoding.
+        if bit_depth != "N/A" and int(bit_depth) < 16:
+            lines.append("  [WARNING] Low bit depth may indicate lossy encoding.\n")
+        # Warn if sample rate is less than 44.1 kHz, suggesting possible lossy encoding.
+        if sample_rate != "N/A" and int(sample_rate) < 44100:
+            lines.append("  [WARNING] Low sample rate may indicate lossy encoding.\n")
+        # Add a blank line for readability.
+        lines.append("\n")
+    except Exception as e:
+        # If formatting fails, add an error message after the lines collected so far.
+        lines.append(f"  [ERROR] Failed to analyze: {e}\n")
+    # Write the whole report to the output stream at once.
+    output_stream.write("".join(lines))
 
 # Function to analyze audio file metadata using ffprobe.
-def analyze_audio(path: str, output_stream, show_progress: bool = True):
+def analyze_audio(path: str, output_stream, show_progress: bool = True, jobs: int = None, cache_folder: Path = Path("Logs"), audio_files: list = None):
     """Analyzes audio file metadata."""
     # Check if ffprobe is available in the system’s PATH.
-    if not shutil.which('ffprobe'):
+    if not FFPROBE_BIN:
         # Print an error and exit if ffprobe is not found.
         print("Error: ffprobe is not installed or not in your PATH.")
         return
 
-    # Determine the list of audio files to analyze.
-    if os.path.isfile(path):
-        # If the path is a file, check if it’s an audio file.
-        if os.path.splitext(path)[1].lower() in AUDIO_EXTENSIONS:
-            audio_files = [Path(path)]
-        else:
-            # Print an error and exit if it’s not a supported audio file.
-            print(f"'{path}' is not a supported audio file.")
-            return
-    elif os.path.isdir(path):
-        # If the path is a directory, use Path.rglob to find all audio files recursively.
-        audio_files = [file for ext in AUDIO_EXTENSIONS for file in Path(path).rglob(f"*{ext}")]
-        # If no audio files are found, print a message and exit.
-        if not audio_files:
-            print(f"No audio files found in '{path}'.")
-            return
-    else:
-        # If the path is neither a file nor directory, print an error and exit.
-        print(f"'{path}' is not a file or directory.")
+    # Determine the list of audio files to process based on the input path, unless it was already found.
+    if audio_files is None:
+        audio_files = find_audio_files(path)
+    # Exit if there is nothing to process; find_audio_files has printed why.
+    if not audio_files:
         return
 
     # Get the total number of files for progress tracking.
@@ -282,61 +832,40 @@ def analyze_audio(path: str, output_stream, show_progress: bool = True):
     if show_progress:
         print_progress_bar(0, total_files, "Analyzing audio")
 
-    # Iterate over each audio file with its index for progress tracking.
-    for index, audio_file in enumerate(audio_files):
-        # Write the file being analyzed to the output stream.
-        output_stream.write(f"Analyzing: {audio_file}\n")
-        try:
-            # Run ffprobe to get metadata in JSON format, suppressing verbose output.
-            cmd = ["ffprobe", "-v", "quiet", "-print_format", "json", "-show_format", "-show_streams", str(audio_file)]
-            result = subprocess.check_output(cmd, universal_newlines=True)
-            # Parse the JSON output into a Python dictionary.
-            data = json.loads(result)
-            # Assume the first stream is the audio stream and extract it.
-            stream = data["streams"][0]
-
-            # Extract metadata fields, defaulting to "N/A" if not present.
-            codec = stream.get("codec_name", "N/A")
-            sample_rate = stream.get("sample_rate", "N/A")
-            channels = stream.get("channels", "N/A")
-            bit_depth = stream.get("bits_per_raw_sample", "N/A")
-            bit_rate = data["format"].get("bit_rate", "N/A")
-
-            # Determine channel information based on the number of channels.
-            channel_info = "N/A" if channels == "N/A" else "Mono" if channels == 1 else "Stereo" if channels == 2 else f"{channels} channels"
-            # Write metadata to the output stream, formatting units appropriately.
-            output_stream.write(f"  Bitrate: {bit_rate} bps\n" if bit_rate != "N/A" else "  Bitrate: N/A\n")
-            output_stream.write(f"  Sample Rate: {sample_rate} Hz\n" if sample_rate != "N/A" else "  Sample Rate: N/A\n")
-            output_stream.write(f"  Bit Depth: {bit_depth} bits\n" if bit_depth != "N/A" else "  Bit Depth: N/A\n")
-            output_stream.write(f"  Channels: {channel_info}\n")
-            output_stream.write(f"  Codec: {codec}\n")
-
-            # Add codec-specific information for .m4a files.
-            if audio_file.suffix.lower() == ".m4a":
-                if "aac" in codec.lower():
-                    output_stream.write("  [INFO] AAC (lossy) codec detected.\n")
-                elif "alac" in codec.lower():
-                    output_stream.write("  [INFO] ALAC (lossless) codec detected.\n")
-                else:
-                    output_stream.write(f"  [WARNING] Unknown codec: {codec}\n")
-            # Note lossy codecs for .opus and .mp3 files.
-            elif audio_file.suffix.lower() in [".opus", ".mp3"]:
-                output_stream.write(f"  [INFO] Lossy codec: {codec}\n")
-            # Warn if bit depth is less than 16, suggesting possible lossy encoding.
-            if bit_depth != "N/A" and int(bit_depth) < 16:
-                output_stream.write("  [WARNING] Low bit depth may indicate lossy encoding.\n")
-            # Warn if sample rate is less than 44.1 kHz, suggesting possible lossy encoding.
-            if sample_rate != "N/A" and int(sample_rate) < 44100:
-                output_stream.write("  [WARNING] Low sample rate may indicate lossy encoding.\n")
-            # Add a blank line for readability.
-            output_stream.write("\n")
-        except Exception as e:
-            # If analysis fails, write an error message to the output stream.
-            output_stream.write(f"  [ERROR] Failed to analyze: {e}\n")
-
-        # If showing progress, update the progress bar.
-        if show_progress:
-            print_progress_bar(index + 1, total_files, "Analyzing audio")
+    # Load the metadata read by earlier runs, so files that haven't changed are not probed again.
+    cache_file = cache_folder / "probe_cache.json"
+    cache = load_cache(cache_file)
+    # Read the modification time and size of each file, which decide whether its cached metadata is valid.
+    signatures = file_signatures(audio_files)
+    # Collect the cached metadata of each file, or None if it has to be read with ffprobe.
+    cached_infos = [get_cached_info(cache, audio_file, signature) for audio_file, signature in zip(audio_files, signatures)]
+    # Make the list of files that have to be probed.
+    pending_files = [audio_file for audio_file, cached in zip(audio_files, cached_infos) if cached is None]
+
+    # Run ffprobe in a thread pool; each probe is a separate process, so threads are enough.
+    executor = ThreadPoolExecutor(max_workers=jobs or os.cpu_count())
+    try:
+        # executor.map yields results in the original file order, keeping the report deterministic.
+        results = executor.map(probe_audio_file, pending_files)
+        # Iterate over each audio file with its signature and cached metadata, and its index for progress tracking.
+        for index, (audio_file, signature, cached) in enumerate(zip(audio_files, signatures, cached_infos)):
+            # Use the cached metadata, or take the next result from the pool (both are in file order).
+            info = cached or next(results)
+            # Remember newly read metadata, so the file is not probed again while it stays unchanged.
+            # Failures are not cached, so they are retried on the next run.
+            if cached is None and signature and not isinstance(info, Exception):
+                cache[os.path.abspath(audio_file)] = {"signature": signature, "info": info}
+            # Write the report for the file from the main thread, so output is never interleaved.
+            write_audio_info(audio_file, info, output_stream)
+
+            # If showing progress, update the progress bar.
+            if show_progress:
+                print_progress_bar(index + 1, total_files, "Analyzing audio")
+    finally:
+        # Cancel queued probes instead of waiting for them (e.g. after Ctrl+C).
+        executor.shutdown(cancel_futures=True)
+        # Save the cache, including the metadata read before an interruption.
+        save_cache(cache_file, cache)
 
 # Main function to set up the command-line interface and dispatch commands.
 def main():
@@ -363,6 +892,24 @@ def main():
     output_group.add_argument("--summary", action="store_true", help="Show progress bar and summary only")
     # Add a flag to save results to a log file.
     check_parser.add_argument("--save-log", action="store_true", help="Save results to a log file")
+    # Add an option for the number of files checked in parallel, defaulting to the CPU count.
+    check_parser.add_argument("--jobs", type=positive_int, help="Number of files to check in parallel (default: CPU count)")
+    # Create a mutually exclusive group for how files are checked (the default is a full FFmpeg decode).
+    method_group = check_parser.add_mutually_exclusive_group()
+    # Add a flag to decode with PyAV inside the script instead of launching one FFmpeg process per file.
+    method_group.add_argument("--in-process", action="store_true", help="Decode with PyAV instead of launching FFmpeg (requires 'pip install av')")
+    # Add a flag to decode only the first and last second of each file, for fast triage.
+    method_group.add_argument("--quick", action="store_true", help="Only decode the first and last second of each file (faster, less thorough)")
+    # Add a flag to only check that files can be opened and parsed with ffprobe, without decoding any audio.
+    method_group.add_argument("--fast", action="store_true", help="Only check file structure with ffprobe, without decoding (fastest, skips frame checks)")
+    # Add a flag to check every file again, ignoring the results cached by earlier runs.
+    check_parser.add_argument("--force", action="store_true", help="Check all files again, ignoring the integrity cache")
+    # Add a flag to stop decoding a file at its first error, which fails it just the same but logs only that error.
+    check_parser.add_argument("--first-error", action="store_true", help="Stop decoding a file at its first FFmpeg error (faster on badly damaged files)")
+    # Add an option for the log format: prose lines, or one JSON record per file that tools (and --resume) can read.
+    check_parser.add_argument("--log-format", choices=["text", "jsonl"], default="text", help="Format of the log file (default: text)")
+    # Add an option to resume an interrupted run from its JSONL log, skipping the files it already checked.
+    check_parser.add_argument("--resume", type=path_type, metavar="LOG", help="Reuse the results recorded in an earlier JSONL log")
 
     # Define the 'cover-art' subcommand for hiding or showing cover art files.
     cover_parser = subparsers.add_parser("cover-art", help="Hide or show cover art files")
@@ -383,6 +930,17 @@ def main():
     info_parser.add_argument("-o", "--output", default="audio_analysis.txt", help="Output file for results")
     # Add a flag for verbose output, disabling the progress bar.
     info_parser.add_argument("--verbose", action="store_true", help="Print results to console (no progress bar)")
+    # Add an option for the number of files analyzed in parallel, defaulting to the CPU count.
+    info_parser.add_argument("--jobs", type=positive_int, help="Number of files to analyze in parallel (default: CPU count)")
+
+    # Define the 'all' subcommand for checking integrity and analyzing metadata in one run.
+    all_parser = subparsers.add_parser("all", help="Check integrity and analyze metadata, scanning the files once")
+    # Add a required argument for the path to process, using the path_type validator.
+    all_parser.add_argument("path", type=path_type, help="File or directory to process")
+    # Add an optional argument for the analysis output file, defaulting to "audio_analysis.txt".
+    all_parser.add_argument("-o", "--output", default="audio_analysis.txt", help="Output file for the metadata analysis")
+    # Add an option for the number of files processed in parallel, defaulting to the CPU count.
+    all_parser.add_argument("--jobs", type=positive_int, help="Number of files to process in parallel (default: CPU count)")
 
     # Parse the command-line arguments.
     args = parser.parse_args()
@@ -390,22 +948,50 @@ def main():
     # Dispatch to the appropriate function based on the command provided.
     if args.command == "check":
         # Call check_integrity with the parsed arguments and log folder.
-        check_integrity(args.path, verbose=args.verbose, summary=args.summary, save_log=args.save_log, log_folder=log_folder)
+        check_integrity(
+            args.path,
+            verbose=args.verbose,
+            summary=args.summary,
+            save_log=args.save_log,
+            log_folder=log_folder,
+            jobs=args.jobs,
+            in_process=args.in_process,
+            quick=args.quick,
+            fast=args.fast,
+            log_format=args.log_format,
+            resume=args.resume,
+            force=args.force,
+            first_error=args.first_error,
+        )
     elif args.command == "cover-art":
         # Call process_cover_art with the path and hide flag (True for --hide, False for --show).
         process_cover_art(args.path, hide=args.hide)
+    elif args.command == "all":
+        # Find the audio files once, and share the list between the integrity check and the analysis.
+        audio_files = find_audio_files(args.path)
+        if audio_files:
+            # Check integrity with a progress bar, a summary and a log file.
+            check_integrity(args.path, summary=True, save_log=True, log_folder=log_folder, jobs=args.jobs, audio_files=audio_files)
+            # Use the specified output file, adding a timestamp if it’s the default.
+            output_file = f"audio_analysis_{datetime.datetime.now().strftime('%Y%m%d')}.txt" if args.output == "audio_analysis.txt" else args.output
+            # Open the output file with a 1 MiB buffer and analyze audio, writing results to it.
+            with open(output_file, "w", buffering=1 << 20) as f:
+                analyze_audio(args.path, f, jobs=args.jobs, cache_folder=log_folder, audio_files=audio_files)
+            # Inform the user where the results were saved.
+            print(f"Analysis complete. Results saved to '{output_file}'")
     elif args.command == "info":
         if args.verbose:
             # If verbose, analyze audio and output to stdout without progress.
-            analyze_audio(args.path, sys.stdout, show_progress=False)
+            analyze_audio(args.path, sys.stdout, show_progress=False, jobs=args.jobs, cache_folder=log_folder)
         else:
             # Otherwise, use the specified output file, adding a timestamp if it’s the default.
             output_file = args.output
             if output_file == "audio_analysis.txt":
                 output_file = f"audio_analysis_{datetime.datetime.now().strftime('%Y%m%d')}.txt"
-            # Open the output file and analyze audio, writing results to it.
-            with open(output_file, "w") as f:
-                analyze_audio(args.path, f)
+            # Open the output file with a 1 MiB buffer and analyze audio, writing results to it.
+            # The per-file reports then reach the disk in a few large writes.
+            with open(output_file, "w", buffering=1 << 20) as f:
+                analyze_audio(args.path, f, jobs=args.jobs, cache_folder=log_folder)
             # Inform the user where the results were saved.
             print(f"Analysis complete. Results saved to '{output_file}'")
 